@@ -6,7 +6,7 @@ def configure_logging(log_level: int = logging.INFO) -> None:
     """Configure root logging for the backend."""
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+        format='%(created).3f | %(levelname)s | %(name)s | %(message)s',
     )
 
 
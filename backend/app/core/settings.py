@@ -1,5 +1,6 @@
 from functools import lru_cache
-from pydantic import BaseSettings, Field
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -9,19 +10,32 @@ class Settings(BaseSettings):
     environment: str = Field(default='local')
     api_version: str = Field(default='0.1.0')
 
-    openai_api_key: str | None = Field(default=None, env='OPENAI_API_KEY')
+    openai_api_key: str | None = Field(default=None)
     openai_chat_model: str = Field(default='gpt-4.1-mini')
     openai_chat_temperature: float = Field(default=0.2)
     openai_chat_max_tokens: int = Field(default=600)
     openai_timeout_sec: int = Field(default=60)
     openai_embed_model: str = Field(default='text-embedding-3-large')
     openai_embed_dimension: int = Field(default=3072)
+    embed_batch_size: int = Field(default=256)
+    embed_concurrency: int = Field(default=8)
+    query_embed_cache_size: int = Field(default=1024)
 
     qdrant_url: str = Field(default='http://localhost:6333')
     qdrant_api_key: str | None = Field(default=None)
+    qdrant_prefer_grpc: bool = Field(default=True)
+    qdrant_grpc_port: int = Field(default=6334)
+    qdrant_timeout_sec: int = Field(default=30)
     qdrant_collection: str = Field(default='workspace_chunks')
+    qdrant_indexing_threshold: int = Field(default=10000)
+    qdrant_quantization: str = Field(default='int8')
+    qdrant_quantization_oversampling: float = Field(default=2.0)
+    upsert_batch_size: int = Field(default=256)
+    upsert_concurrency: int = Field(default=4)
 
     redis_url: str = Field(default='redis://localhost:6379/0')
+    redis_max_connections: int = Field(default=32)
+    redis_health_check_interval_sec: int = Field(default=30)
 
     notes_dir: str = Field(default='../notes')
     allowed_exts: str = Field(default='.pdf,.docx,.xlsx,.csv,.md,.txt,.log')
@@ -29,19 +43,28 @@ class Settings(BaseSettings):
     chunk_size: int = Field(default=700)
     chunk_overlap: int = Field(default=80)
     chunk_strategy: str = Field(default='recursive')
+    ingest_concurrency: int = Field(default=4)
+    ingest_window_size: int = Field(default=32)
+    bulk_ingest_threshold: int = Field(default=20)
+    upload_concurrency: int = Field(default=4)
+    manifest_flush_interval_sec: float = Field(default=1.0)
 
     rag_top_k: int = Field(default=10)
     max_context_tokens: int = Field(default=2500)
     verbatim_default: int = Field(default=0)
+    max_quote_chars: int = Field(default=400)
 
     cache_rewrite_ttl_sec: int = Field(default=86400)
     cache_retrieval_ttl_sec: int = Field(default=3600)
     cache_compress_ttl_sec: int = Field(default=1800)
     cache_answer_ttl_sec: int = Field(default=900)
 
-    class Config:
-        env_file = 'backend/.env'
-        env_file_encoding = 'utf-8'
+    model_config = SettingsConfigDict(
+        env_file='backend/.env',
+        env_file_encoding='utf-8',
+        extra='ignore',
+        frozen=True,
+    )
 
 
 @lru_cache()
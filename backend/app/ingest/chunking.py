@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
 
 from langchain.text_splitter import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
 
@@ -12,6 +20,27 @@ logger = get_logger(__name__)
 
 DEFAULT_SEPARATORS = ['\n\n', '\n', '. ', ' ']
 HEADER_FIELDS = ('h1', 'h2', 'h3', 'h4')
+_SEP_RE = re.compile(r'(\n\n|\n|\. | )')
+_MD_HEADER_RE = re.compile(r'^[ \t]*#{1,4}(?:[ \t]|$)', re.MULTILINE)
+_WS_TABLE = str.maketrans({'\u00a0': ' ', '\r': ''})
+_INNER_SPACE_RUN_RE = re.compile(r'(?<=\S)[ \t]{2,}', re.ASCII)
+INLINE_MAX_JOBS = 1
+INLINE_MAX_CHARS = 200_000
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
+class Chunk:
+    """A single chunk of document text plus the payload stored alongside its vector."""
+
+    chunk_id: str
+    content: str
+    metadata: Dict[str, Any]
+
+
+# (document_id, filename, raw_text, chunk_size, chunk_overlap, source_extension, chunk_strategy)
+ChunkJob = Tuple[str, str, str, int, int, str | None, str]
 
 
 def chunk_text(
@@ -22,13 +51,17 @@ def chunk_text(
     chunk_overlap: int,
     source_extension: str | None = None,
     chunk_strategy: str = 'recursive',
-) -> List[Dict[str, Any]]:
-    logger.info('🧩 chunk_text starting...')
+) -> List[Chunk]:
+    logger.debug('🧩 chunk_text starting...')
     normalized_strategy = (chunk_strategy or 'recursive').lower()
     normalized_extension = (source_extension or '').lower()
-    structured: List[Dict[str, Any]] = []
+    structured: List[Chunk] = []
 
-    if normalized_strategy in {'markdown', 'auto'} and normalized_extension == '.md':
+    if (
+        normalized_strategy in {'markdown', 'auto'}
+        and normalized_extension == '.md'
+        and _has_markdown_headers(raw_text)
+    ):
         structured = _chunk_markdown(
             document_id=document_id,
             filename=filename,
@@ -39,12 +72,7 @@ def chunk_text(
             chunk_strategy=normalized_strategy,
         )
     else:
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=DEFAULT_SEPARATORS,
-        )
-        chunks = splitter.split_text(raw_text)
+        chunks = _recursive_split(raw_text, chunk_size, chunk_overlap)
         structured = _format_chunks(
             document_id=document_id,
             filename=filename,
@@ -53,10 +81,73 @@ def chunk_text(
             chunk_strategy=normalized_strategy,
         )
 
-    logger.info('✅ 🧩 chunk_text done.')
+    logger.debug('✅ 🧩 chunk_text done.')
     return structured
 
 
+def chunk_text_batch(jobs: Sequence[ChunkJob]) -> List[List[Chunk]]:
+    """Chunk many documents across worker processes, preserving job order."""
+    logger.debug('🧩 chunk_text_batch starting jobs=%s', len(jobs))
+    total_chars = sum(len(job[2]) for job in jobs)
+    if len(jobs) <= INLINE_MAX_JOBS or total_chars <= INLINE_MAX_CHARS:
+        results = [_chunk_one(job) for job in jobs]
+    else:
+        pool = _get_pool()
+        try:
+            results = list(pool.map(_chunk_one, jobs, chunksize=4))
+        except BrokenProcessPool:
+            logger.warning('⚠️ chunk_text_batch pool broken, chunking in-process jobs=%s', len(jobs))
+            _discard_pool(pool)
+            results = [_chunk_one(job) for job in jobs]
+    logger.debug('✅ 🧩 chunk_text_batch done chars=%s', total_chars)
+    return results
+
+
+def shutdown_chunk_pool() -> None:
+    """Stop the shared chunking workers; the next batch starts a fresh pool."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _POOL
+
+
+def _chunk_one(job: ChunkJob) -> List[Chunk]:
+    document_id, filename, raw_text, chunk_size, chunk_overlap, source_extension, chunk_strategy = job
+    return chunk_text(
+        document_id=document_id,
+        filename=filename,
+        raw_text=_normalize_whitespace(raw_text),
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        source_extension=source_extension,
+        chunk_strategy=chunk_strategy,
+    )
+
+
+def _normalize_whitespace(text: str) -> str:
+    return _INNER_SPACE_RUN_RE.sub(' ', text.translate(_WS_TABLE))
+
+
 def _chunk_markdown(
     document_id: str,
     filename: str,
@@ -65,19 +156,11 @@ def _chunk_markdown(
     chunk_overlap: int,
     source_extension: str,
     chunk_strategy: str,
-) -> List[Dict[str, Any]]:
-    header_splitter = MarkdownHeaderTextSplitter(
-        headers_to_split_on=[('#', 'h1'), ('##', 'h2'), ('###', 'h3'), ('####', 'h4')],
-    )
-    header_docs = header_splitter.split_text(raw_text)
+) -> List[Chunk]:
+    header_docs = _get_header_splitter().split_text(raw_text)
     if not header_docs:
         return []
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=DEFAULT_SEPARATORS,
-    )
-    docs = splitter.split_documents(header_docs)
+    docs = _get_recursive_splitter(chunk_size, chunk_overlap).split_documents(header_docs)
     chunks = [doc.page_content for doc in docs]
     metadata_list = [doc.metadata or {} for doc in docs]
     return _format_chunks(
@@ -90,6 +173,72 @@ def _chunk_markdown(
     )
 
 
+def _has_markdown_headers(raw_text: str) -> bool:
+    return _MD_HEADER_RE.search(raw_text) is not None
+
+
+@lru_cache(maxsize=8)
+def _get_recursive_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=DEFAULT_SEPARATORS,
+    )
+
+
+@lru_cache()
+def _get_header_splitter() -> MarkdownHeaderTextSplitter:
+    return MarkdownHeaderTextSplitter(
+        headers_to_split_on=[('#', 'h1'), ('##', 'h2'), ('###', 'h3'), ('####', 'h4')],
+    )
+
+
+def _recursive_split(text: str, size: int, overlap: int) -> List[str]:
+    """Split on DEFAULT_SEPARATORS in one regex pass, then greedily merge up to ``size``."""
+    pieces = _SEP_RE.split(text)
+    segments = [''.join(pair) for pair in zip(pieces[::2], pieces[1::2])]
+    if len(pieces) % 2:
+        segments.append(pieces[-1])
+
+    chunks: List[str] = []
+    buf: List[str] = []
+    buf_len = 0
+    for segment in segments:
+        if not segment:
+            continue
+        seg_len = len(segment)
+        if buf and buf_len + seg_len > size:
+            joined = ''.join(buf)
+            cleaned = joined.strip()
+            if cleaned:
+                chunks.append(cleaned)
+            seed = _overlap_tail(joined, overlap)
+            if seed and len(seed) + seg_len <= size:
+                buf = [seed]
+                buf_len = len(seed)
+            else:
+                buf = []
+                buf_len = 0
+        buf.append(segment)
+        buf_len += seg_len
+    if buf:
+        cleaned = ''.join(buf).strip()
+        if cleaned:
+            chunks.append(cleaned)
+    return chunks
+
+
+def _overlap_tail(joined: str, overlap: int) -> str:
+    if overlap <= 0 or not joined:
+        return ''
+    window_start = max(len(joined) - overlap, 0)
+    for separator in DEFAULT_SEPARATORS:
+        idx = joined.rfind(separator, window_start, len(joined) - 1)
+        if idx != -1:
+            return joined[idx + len(separator):]
+    return joined[window_start:]
+
+
 def _format_chunks(
     document_id: str,
     filename: str,
@@ -97,13 +246,16 @@ def _format_chunks(
     source_extension: str,
     chunk_strategy: str,
     metadata_list: List[Dict[str, Any]] | None = None,
-) -> List[Dict[str, Any]]:
-    structured: List[Dict[str, Any]] = []
+) -> List[Chunk]:
+    structured: List[Chunk] = []
+    append = structured.append
     total_chunks = len(chunks)
+    chunk_id_prefix = f'{document_id}-chunk-'
+    extension_metadata = {'source_extension': source_extension} if source_extension else {}
     for idx, chunk in enumerate(chunks):
-        chunk_id = f'{document_id}-chunk-{idx}'
+        chunk_id = chunk_id_prefix + str(idx)
         extra_metadata = metadata_list[idx] if metadata_list else {}
-        section_title = _section_title(extra_metadata)
+        section_title = _section_title(extra_metadata) if extra_metadata else None
         metadata = {
             'chunk_id': chunk_id,
             'document_id': document_id,
@@ -112,19 +264,11 @@ def _format_chunks(
             'chunk_total': total_chunks,
             'content_length': len(chunk),
             'chunk_strategy': chunk_strategy,
+            **extension_metadata,
+            **({'section_title': section_title} if section_title else {}),
+            **extra_metadata,
         }
-        if source_extension:
-            metadata['source_extension'] = source_extension
-        if section_title:
-            metadata['section_title'] = section_title
-        metadata.update(extra_metadata)
-        structured.append(
-            {
-                'chunk_id': chunk_id,
-                'content': chunk,
-                'metadata': metadata,
-            }
-        )
+        append(Chunk(chunk_id=chunk_id, content=chunk, metadata=metadata))
     return structured
 
 
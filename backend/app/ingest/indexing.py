@@ -2,36 +2,122 @@
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+import os
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
+
+import orjson
 
 from ..core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-MANIFEST_FILENAME = '.compass_index.json'
+MANIFEST_FILENAME = '.compass_index.ndjson'
+LEGACY_MANIFEST_FILENAME = '.compass_index.json'
+COMPACTION_RATIO = 2
 Manifest = Dict[str, Dict[str, Any]]
+_RECORD_COUNTS: Dict[str, int] = {}
 
 
 def load_manifest(notes_dir: Path) -> Manifest:
-    logger.info('📗 load_manifest starting...')
+    logger.debug('📗 load_manifest starting...')
     manifest_path = notes_dir / MANIFEST_FILENAME
     if not manifest_path.exists():
-        logger.info('✅ 📗 load_manifest done.')
-        return {}
+        manifest = _load_legacy_manifest(notes_dir)
+        logger.debug('✅ 📗 load_manifest done.')
+        return manifest
     logger.debug('📄 load_manifest path=%s', manifest_path)
-    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
-    logger.info('✅ 📗 load_manifest done.')
+    manifest: Manifest = {}
+    record_count = 0
+    for line in manifest_path.read_bytes().splitlines():
+        if not line:
+            continue
+        record_count += 1
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # A crash mid-append can leave a torn final line; later records still win.
+            logger.warning('⚠️ load_manifest skipped malformed record path=%s', manifest_path)
+            continue
+        filename = record.pop('filename', None)
+        if not filename:
+            continue
+        if record.get('deleted'):
+            manifest.pop(filename, None)
+        else:
+            manifest[filename] = record
+    _RECORD_COUNTS[str(manifest_path)] = record_count
+    logger.debug('✅ 📗 load_manifest done.')
     return manifest
 
 
-def save_manifest(notes_dir: Path, manifest: Manifest) -> None:
-    logger.info('📘 save_manifest starting...')
+def save_manifest(notes_dir: Path, manifest: Manifest, changed: Iterable[str] | None = None) -> None:
+    """Append records for ``changed`` filenames, or rewrite the whole manifest when omitted."""
+    logger.debug('📘 save_manifest starting...')
+    manifest_path = notes_dir / MANIFEST_FILENAME
+    if changed is None or not manifest_path.exists():
+        compact_manifest(notes_dir, manifest)
+        logger.debug('✅ 📘 save_manifest done.')
+        return
+    lines = [_manifest_record(name, manifest.get(name)) for name in changed]
+    if lines:
+        _append_records(manifest_path, b''.join(lines))
+    cache_key = str(manifest_path)
+    record_count = _RECORD_COUNTS.get(cache_key)
+    if record_count is None:
+        record_count = manifest_path.read_bytes().count(b'\n')
+    else:
+        record_count += len(lines)
+    _RECORD_COUNTS[cache_key] = record_count
+    if record_count > COMPACTION_RATIO * max(len(manifest), 1):
+        compact_manifest(notes_dir, manifest)
+    logger.debug('✅ 📘 save_manifest done.')
+
+
+def compact_manifest(notes_dir: Path, manifest: Manifest) -> None:
+    """Rewrite the manifest with one record per live file, swapping it in atomically."""
+    logger.debug('🗜️ compact_manifest starting...')
     manifest_path = notes_dir / MANIFEST_FILENAME
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
-    logger.info('✅ 📘 save_manifest done.')
+    temp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    temp_path.write_bytes(b''.join(_manifest_record(name, info) for name, info in manifest.items()))
+    os.replace(temp_path, manifest_path)
+    _RECORD_COUNTS[str(manifest_path)] = len(manifest)
+    legacy_path = notes_dir / LEGACY_MANIFEST_FILENAME
+    if legacy_path.exists():
+        legacy_path.unlink()
+    logger.debug('✅ 🗜️ compact_manifest done.')
+
+
+def _append_records(manifest_path: Path, payload: bytes) -> None:
+    if not _ends_with_newline(manifest_path):
+        # Terminate a torn final line so it cannot swallow the first new record.
+        payload = b'\n' + payload
+    # O_APPEND, so concurrent writers never overwrite each other's records.
+    with manifest_path.open('ab') as manifest_file:
+        manifest_file.write(payload)
+
+
+def _ends_with_newline(manifest_path: Path) -> bool:
+    with manifest_path.open('rb') as manifest_file:
+        end = manifest_file.seek(0, os.SEEK_END)
+        if not end:
+            return True
+        manifest_file.seek(end - 1)
+        return manifest_file.read(1) == b'\n'
+
+
+def _manifest_record(filename: str, info: Dict[str, Any] | None) -> bytes:
+    record = {'filename': filename, **info} if info is not None else {'filename': filename, 'deleted': True}
+    return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _load_legacy_manifest(notes_dir: Path) -> Manifest:
+    legacy_path = notes_dir / LEGACY_MANIFEST_FILENAME
+    if not legacy_path.exists():
+        return {}
+    logger.debug('📄 load_manifest legacy_path=%s', legacy_path)
+    return orjson.loads(legacy_path.read_bytes())
 
 
 def update_manifest_entry(
@@ -41,20 +127,25 @@ def update_manifest_entry(
     file_hash: str,
     total_chunks: int,
     size_bytes: int,
+    now_iso: str | None = None,
+    mtime_ns: int | None = None,
 ) -> None:
-    logger.info('📝 update_manifest_entry starting...')
     manifest[filename] = {
         'document_id': document_id,
         'hash': file_hash,
         'size_bytes': size_bytes,
+        'mtime_ns': mtime_ns,
         'total_chunks': total_chunks,
-        'last_ingested_at': datetime.utcnow().isoformat(),
+        'last_ingested_at': now_iso or utc_now_iso(),
     }
-    logger.info('✅ 📝 update_manifest_entry done.')
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
 
 
 def manifest_to_list(manifest: Manifest) -> List[Dict[str, Any]]:
-    logger.info('📚 manifest_to_list starting...')
+    logger.debug('📚 manifest_to_list starting...')
     entries: List[Dict[str, Any]] = []
     for filename, info in manifest.items():
         entries.append(
@@ -66,5 +157,5 @@ def manifest_to_list(manifest: Manifest) -> List[Dict[str, Any]]:
                 'total_chunks': info.get('total_chunks'),
             }
         )
-    logger.info('✅ 📚 manifest_to_list done.')
+    logger.debug('✅ 📚 manifest_to_list done.')
     return entries
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import csv
 import io
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 import docx2txt
-import pandas as pd
+from openpyxl import load_workbook
 from pypdf import PdfReader
 
 from ..core.logging_config import get_logger
@@ -16,41 +17,54 @@ logger = get_logger(__name__)
 
 
 def load_document(file_path: str) -> Optional[str]:
-    logger.info('📚 load_document starting...')
+    logger.debug('📚 load_document starting...')
     path = Path(file_path)
     if not path.exists():
         logger.warning('⚠️ file missing path=%s', path)
         return None
-    suffix = path.suffix.lower()
+    handler = _LOADERS.get(path.suffix.lower())
+    if handler is None:
+        logger.warning('⚠️ unsupported_extension path=%s', path)
+        return None
     try:
-        if suffix == '.pdf':
-            return _load_pdf(path)
-        if suffix == '.docx':
-            return docx2txt.process(str(path))
-        if suffix in {'.csv', '.xlsx'}:
-            return _load_tabular(path)
-        if suffix in {'.md', '.txt', '.log'}:
-            return path.read_text(encoding='utf-8', errors='ignore')
+        return handler(path)
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception('💥 load_document error path=%s exc=%s', path, exc)
         return None
-    logger.warning('⚠️ unsupported_extension path=%s', path)
-    return None
+
+
+def _read_text(path: Path) -> str:
+    return path.read_text(encoding='utf-8', errors='ignore')
+
+
+def _load_docx(path: Path) -> str:
+    return docx2txt.process(str(path))
 
 
 def _load_pdf(path: Path) -> str:
     reader = PdfReader(str(path))
-    output = io.StringIO()
-    for page in reader.pages:
-        text = page.extract_text() or ''
-        output.write(text)
-        output.write('\n')
-    return output.getvalue()
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
 
 
 def _load_tabular(path: Path) -> str:
     if path.suffix.lower() == '.csv':
-        df = pd.read_csv(path)
-    else:
-        df = pd.read_excel(path, engine='openpyxl')
-    return df.to_csv(index=False)
+        return path.read_text(encoding='utf-8', errors='ignore')
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerows(workbook.worksheets[0].iter_rows(values_only=True))
+        return output.getvalue()
+    finally:
+        workbook.close()
+
+
+_LOADERS: Dict[str, Callable[[Path], str]] = {
+    '.pdf': _load_pdf,
+    '.docx': _load_docx,
+    '.csv': _load_tabular,
+    '.xlsx': _load_tabular,
+    '.md': _read_text,
+    '.txt': _read_text,
+    '.log': _read_text,
+}
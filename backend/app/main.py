@@ -1,8 +1,11 @@
+import asyncio
+
 from redis.asyncio import Redis
 from fastapi import FastAPI
 
 from .core.logging_config import configure_logging, get_logger
 from .core.settings import get_settings
+from .ingest.chunking import shutdown_chunk_pool
 from .rag import RagCache, RagPipeline
 from .routers import ask, files, health, ingest, source
 
@@ -38,9 +41,15 @@ app = create_app()
 async def on_startup() -> None:
     logger.info('🚀 startup starting...')
     settings = get_settings()
-    app.state.redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    app.state.redis = Redis.from_url(
+        settings.redis_url,
+        decode_responses=False,
+        max_connections=settings.redis_max_connections,
+        health_check_interval=settings.redis_health_check_interval_sec,
+    )
     app.state.rag_cache = RagCache(app.state.redis, settings)
     app.state.rag_pipeline = RagPipeline(settings, app.state.rag_cache)
+    await app.state.rag_pipeline.warmup()
     logger.info('✅ 🚀 startup done.')
 
 
@@ -50,4 +59,5 @@ async def on_shutdown() -> None:
     redis_client: Redis | None = getattr(app.state, 'redis', None)
     if redis_client:
         await redis_client.close()
+    await asyncio.to_thread(shutdown_chunk_pool)
     logger.info('✅ 🛬 shutdown done.')
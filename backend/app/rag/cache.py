@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import json
-from typing import Any, Iterable
+from typing import Any, Dict, Iterable, List, Tuple
 
+import msgpack
+import xxhash
 from redis.asyncio import Redis
 
 from ..core.logging_config import get_logger
@@ -12,12 +13,12 @@ from ..core.settings import Settings
 
 logger = get_logger(__name__)
 
+# (key, packed value, ttl_seconds) queued for a pipelined write.
+CacheEntry = Tuple[str, bytes, int]
 
-def _hash_inputs(values: Iterable[str]) -> str:
-    from ..utils.hashing import hash_text
 
-    joined = '::'.join(values)
-    return hash_text(joined)
+def _hash_inputs(values: Iterable[str]) -> str:
+    return xxhash.xxh3_64_hexdigest('::'.join(values).encode('utf-8'))
 
 
 def _rewrite_key(query: str) -> str:
@@ -36,17 +37,45 @@ def _answer_key(query: str, model: str, mode: str) -> str:
     return f'answer:{_hash_inputs([query, model, mode])}'
 
 
+def _decode(key: str, value: bytes | None) -> Any | None:
+    if not value:
+        return None
+    try:
+        return msgpack.unpackb(value, raw=False)
+    except (msgpack.UnpackException, ValueError):
+        # Entries written before the msgpack switch are treated as misses.
+        logger.debug('⚠️ cache_get undecodable key=%s', key)
+        return None
+
+
 async def cache_get(redis_client: Redis, key: str) -> Any | None:
     logger.debug('🧊 cache_get key=%s', key)
-    value = await redis_client.get(key)
-    if value:
-        return json.loads(value)
-    return None
+    return _decode(key, await redis_client.get(key))
+
+
+async def cache_mget(redis_client: Redis, keys: List[str]) -> List[Any | None]:
+    if not keys:
+        return []
+    logger.debug('🧊 cache_mget keys=%s', keys)
+    values = await redis_client.mget(keys)
+    return [_decode(key, value) for key, value in zip(keys, values)]
+
+
+def _entry(key: str, value: Any, ttl_seconds: int) -> CacheEntry:
+    return key, msgpack.packb(value, use_bin_type=True), ttl_seconds
 
 
 async def cache_set(redis_client: Redis, key: str, value: Any, ttl_seconds: int) -> None:
     logger.debug('🔥 cache_set key=%s ttl=%s', key, ttl_seconds)
-    await redis_client.set(key, json.dumps(value), ex=ttl_seconds)
+    await redis_client.set(key, msgpack.packb(value, use_bin_type=True), ex=ttl_seconds)
+
+
+async def cache_set_many(redis_client: Redis, entries: Iterable[CacheEntry]) -> None:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, payload, ttl_seconds in entries:
+            logger.debug('🔥 cache_set_many key=%s ttl=%s', key, ttl_seconds)
+            pipe.set(key, payload, ex=ttl_seconds)
+        await pipe.execute()
 
 
 class RagCache:
@@ -54,15 +83,33 @@ class RagCache:
         self.redis = redis_client
         self.settings = settings
 
+    async def prefetch(self, query: str, top_k: int, mode: str) -> Dict[str, Any | None]:
+        """Probe the rewrite, retrieval, and answer caches for ``query`` in one MGET."""
+        rewrite, retrieval, answer = await cache_mget(
+            self.redis,
+            [
+                _rewrite_key(query),
+                _retrieve_key(query, top_k),
+                _answer_key(query, self.settings.openai_chat_model, mode),
+            ],
+        )
+        return {'rewrite': rewrite, 'retrieval': retrieval, 'answer': answer}
+
     async def get_rewrite(self, query: str) -> Any | None:
         return await cache_get(self.redis, _rewrite_key(query))
 
+    async def get_rewrites(self, queries: List[str]) -> List[Any | None]:
+        return await cache_mget(self.redis, [_rewrite_key(query) for query in queries])
+
     async def set_rewrite(self, query: str, value: Any) -> None:
         await cache_set(self.redis, _rewrite_key(query), value, self.settings.cache_rewrite_ttl_sec)
 
     async def get_retrieval(self, query: str, top_k: int) -> Any | None:
         return await cache_get(self.redis, _retrieve_key(query, top_k))
 
+    async def get_retrievals(self, queries: List[str], top_k: int) -> List[Any | None]:
+        return await cache_mget(self.redis, [_retrieve_key(query, top_k) for query in queries])
+
     async def set_retrieval(self, query: str, top_k: int, value: Any) -> None:
         await cache_set(
             self.redis,
@@ -92,3 +139,24 @@ class RagCache:
             value,
             self.settings.cache_answer_ttl_sec,
         )
+
+    def rewrite_entry(self, query: str, value: Any) -> CacheEntry:
+        return _entry(_rewrite_key(query), value, self.settings.cache_rewrite_ttl_sec)
+
+    def retrieval_entry(self, query: str, top_k: int, value: Any) -> CacheEntry:
+        return _entry(_retrieve_key(query, top_k), value, self.settings.cache_retrieval_ttl_sec)
+
+    def compress_entry(self, query: str, chunk_ids: Iterable[str], value: Any) -> CacheEntry:
+        return _entry(_compress_key(query, chunk_ids), value, self.settings.cache_compress_ttl_sec)
+
+    def answer_entry(self, query: str, mode: str, value: Any) -> CacheEntry:
+        return _entry(
+            _answer_key(query, self.settings.openai_chat_model, mode),
+            value,
+            self.settings.cache_answer_ttl_sec,
+        )
+
+    async def flush_writes(self, entries: List[CacheEntry]) -> None:
+        """Write queued entries in a single non-transactional pipeline round-trip."""
+        if entries:
+            await cache_set_many(self.redis, entries)
@@ -2,24 +2,38 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, List
 
+import numpy as np
+import tiktoken
+
 from ..core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+TOKEN_ENCODING = 'cl100k_base'
+
+
+@lru_cache()
+def _get_encoding() -> tiktoken.Encoding:
+    return tiktoken.get_encoding(TOKEN_ENCODING)
+
 
 def compress_chunks(chunks: List[Dict[str, Any]], max_tokens: int) -> List[Dict[str, Any]]:
-    logger.info('🔧 compress_chunks starting...')
-    trimmed: List[Dict[str, Any]] = []
-    running_tokens = 0
-    for chunk in chunks:
-        content = chunk.get('content', '')
-        token_estimate = len(content.split())
-        if running_tokens + token_estimate > max_tokens:
-            break
-        trimmed.append(chunk)
-        running_tokens += token_estimate
+    logger.debug('🔧 compress_chunks starting...')
+    if not chunks:
+        logger.debug('✅ 🔧 compress_chunks done.')
+        return []
+    encoded = _get_encoding().encode_batch(
+        [chunk.get('content', '') for chunk in chunks],
+        num_threads=4,
+        disallowed_special=(),
+    )
+    running = np.cumsum(np.fromiter((len(tokens) for tokens in encoded), dtype=np.int64, count=len(chunks)))
+    cutoff = int(np.searchsorted(running, max_tokens, side='right'))
+    trimmed = chunks[:cutoff]
+    running_tokens = int(running[cutoff - 1]) if cutoff else 0
     logger.debug('✂️ trimmed_chunks=%s tokens=%s', len(trimmed), running_tokens)
-    logger.info('✅ 🔧 compress_chunks done.')
+    logger.debug('✅ 🔧 compress_chunks done.')
     return trimmed
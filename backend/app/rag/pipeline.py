@@ -3,29 +3,56 @@
 from __future__ import annotations
 
 import asyncio
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, List, Sequence, Tuple
 
 from langchain_community.vectorstores import Qdrant as QdrantVectorStore
-from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 
 from ..core.logging_config import get_logger
 from ..core.settings import Settings
-from ..ingest.chunking import chunk_text
-from ..ingest.indexing import load_manifest, save_manifest, update_manifest_entry
+from ..ingest.chunking import Chunk, ChunkJob, chunk_text_batch
+from ..ingest.indexing import load_manifest, save_manifest, update_manifest_entry, utc_now_iso
 from ..ingest.loaders import load_document
-from ..rag.cache import RagCache
+from ..rag.cache import CacheEntry, RagCache
 from ..rag.compressor import compress_chunks
-from ..rag.prompts import SYSTEM_PROMPT
+from ..rag.prompts import ANSWER_PROMPT
 from ..utils.files import allowed_extensions
 from ..utils.hashing import hash_file, hash_text
 from ..utils.normalize import normalize_text
 
 logger = get_logger(__name__)
 
+# (file_path, file_hash, stat taken before hashing)
+PlanEntry = Tuple[Path, str, os.stat_result]
+
+PAYLOAD_INDEXES: Dict[str, qmodels.PayloadSchemaType] = {
+    'document_id': qmodels.PayloadSchemaType.KEYWORD,
+    'filename': qmodels.PayloadSchemaType.KEYWORD,
+    'page': qmodels.PayloadSchemaType.INTEGER,
+}
+
+
+@lru_cache(maxsize=4096)
+def _selector_for_document(document_id: str) -> qmodels.FilterSelector:
+    """Build the delete selector once per document; re-ingests reuse the same model objects."""
+    return qmodels.FilterSelector(
+        filter=qmodels.Filter(
+            must=[
+                qmodels.FieldCondition(
+                    key='document_id',
+                    match=qmodels.MatchValue(value=document_id),
+                )
+            ]
+        )
+    )
+
 
 class RagPipeline:
     """Coordinates ingestion into Qdrant and RAG answering."""
@@ -35,7 +62,13 @@ class RagPipeline:
         self.settings = settings
         self.cache = cache
         self.allowed_exts = allowed_extensions(settings)
-        self.qdrant_client = QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+        self.qdrant_client = QdrantClient(
+            url=settings.qdrant_url,
+            api_key=settings.qdrant_api_key,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
+            timeout=settings.qdrant_timeout_sec,
+        )
         self.embeddings = OpenAIEmbeddings(
             model=settings.openai_embed_model,
             api_key=settings.openai_api_key,
@@ -53,6 +86,12 @@ class RagPipeline:
             timeout=settings.openai_timeout_sec,
             openai_api_key=settings.openai_api_key,
         )
+        self._answer_chain = ANSWER_PROMPT | self.chat_model
+        self._embed_cache: OrderedDict[str, List[float]] = OrderedDict()
+        self._embed_semaphore = asyncio.Semaphore(max(settings.embed_concurrency, 1))
+        self._upsert_semaphore = asyncio.Semaphore(max(settings.upsert_concurrency, 1))
+        self._quantization = self._quantization_config()
+        self._search_params = self._build_search_params()
         self._ensure_collection()
         logger.info('✅ 🧠 rag_pipeline_init done.')
 
@@ -67,17 +106,65 @@ class RagPipeline:
                     size=self.settings.openai_embed_dimension,
                     distance=qmodels.Distance.COSINE,
                 ),
+                quantization_config=self._quantization,
             )
+        self._ensure_payload_indexes()
         logger.info('✅ 🏗️ ensure_qdrant_collection done.')
 
+    def _ensure_payload_indexes(self) -> None:
+        collection_info = self.qdrant_client.get_collection(self.settings.qdrant_collection)
+        existing = collection_info.payload_schema or {}
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            if field_name in existing:
+                continue
+            logger.info('🗂️ create_payload_index field=%s', field_name)
+            self.qdrant_client.create_payload_index(
+                collection_name=self.settings.qdrant_collection,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+
+    async def warmup(self) -> None:
+        """Open Redis, Qdrant, and OpenAI connections before the first request needs them."""
+        logger.info('🔥 rag_pipeline_warmup starting...')
+        try:
+            await self.cache.redis.ping()
+            await asyncio.to_thread(self.qdrant_client.get_collection, self.settings.qdrant_collection)
+            await self.embeddings.aembed_query('warmup')
+        except Exception as exc:  # pragma: no cover - warmup is best effort
+            logger.warning('⚠️ rag_pipeline_warmup failed exc=%s', exc)
+            return
+        logger.info('✅ 🔥 rag_pipeline_warmup done.')
+
+    def _quantization_config(self) -> qmodels.QuantizationConfig | None:
+        mode = (self.settings.qdrant_quantization or 'none').lower()
+        if mode == 'int8':
+            return qmodels.ScalarQuantization(
+                scalar=qmodels.ScalarQuantizationConfig(type=qmodels.ScalarType.INT8, always_ram=True),
+            )
+        if mode == 'binary':
+            return qmodels.BinaryQuantization(binary=qmodels.BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def _build_search_params(self) -> qmodels.SearchParams | None:
+        if self._quantization is None:
+            return None
+        return qmodels.SearchParams(
+            quantization=qmodels.QuantizationSearchParams(
+                rescore=True,
+                oversampling=self.settings.qdrant_quantization_oversampling,
+            ),
+        )
+
     async def refresh_notes(self, force: bool = False) -> Dict[str, int]:
         logger.info('🔁 refresh_notes starting...')
         notes_dir = Path(self.settings.notes_dir).resolve()
         notes_dir.mkdir(parents=True, exist_ok=True)
         manifest = load_manifest(notes_dir)
-        ingest_plan = self._build_ingest_plan(notes_dir, manifest, force=force)
-        summary = await self._ingest_plan(manifest, ingest_plan)
-        save_manifest(notes_dir, manifest)
+        async with self._manifest_write_behind(notes_dir, manifest) as changed:
+            ingest_plan, deleted_names = await self._build_ingest_plan(notes_dir, manifest, force=force, changed=changed)
+            async with self._bulk_ingest_context(len(ingest_plan)):
+                summary = await self._ingest_plan(manifest, ingest_plan, changed=changed, deleted_names=deleted_names)
         logger.info('✅ 🔁 refresh_notes done.')
         return summary
 
@@ -86,90 +173,220 @@ class RagPipeline:
         notes_dir = Path(self.settings.notes_dir).resolve()
         notes_dir.mkdir(parents=True, exist_ok=True)
         manifest = load_manifest(notes_dir)
-        ingest_plan: List[Tuple[Path, str]] = []
+        ingest_plan: List[PlanEntry] = []
         for file_path in file_paths:
             if not file_path.exists():
                 continue
-            file_hash = hash_file(file_path)
-            ingest_plan.append((file_path, file_hash))
-        summary = await self._ingest_plan(manifest, ingest_plan, force=True)
-        save_manifest(notes_dir, manifest)
+            stat_result = file_path.stat()
+            file_hash = await asyncio.to_thread(hash_file, file_path)
+            ingest_plan.append((file_path, file_hash, stat_result))
+        async with self._manifest_write_behind(notes_dir, manifest) as changed:
+            async with self._bulk_ingest_context(len(ingest_plan)):
+                summary = await self._ingest_plan(manifest, ingest_plan, force=True, changed=changed)
         logger.info('✅ 📥 ingest_files done.')
         return summary
 
-    def _build_ingest_plan(
+    @asynccontextmanager
+    async def _manifest_write_behind(
+        self,
+        notes_dir: Path,
+        manifest: Dict[str, Dict[str, Any]],
+    ) -> AsyncIterator[set[str]]:
+        """Yield the ``changed`` set, appending its entries to disk at most once per flush interval.
+
+        A crash mid-ingest then loses at most one interval of work instead of the whole run.
+        """
+        changed: set[str] = set()
+        stop = asyncio.Event()
+        interval = self.settings.manifest_flush_interval_sec
+
+        async def _flush() -> None:
+            if not changed:
+                return
+            names = list(changed)
+            changed.clear()
+            try:
+                # Snapshot on the loop thread so ingest tasks can keep updating the live manifest.
+                await asyncio.to_thread(save_manifest, notes_dir, dict(manifest), names)
+            except Exception:
+                changed.update(names)
+                raise
+
+        async def _flush_loop() -> None:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    try:
+                        await _flush()
+                    except Exception as exc:  # pragma: no cover - retried by the final flush
+                        logger.warning('⚠️ manifest_write_behind flush failed exc=%s', exc)
+
+        flush_task = asyncio.create_task(_flush_loop()) if interval > 0 else None
+        try:
+            yield changed
+        finally:
+            stop.set()
+            if flush_task is not None:
+                # Let an in-flight write finish rather than cancelling it mid-append.
+                await flush_task
+            await _flush()
+
+    @asynccontextmanager
+    async def _bulk_ingest_context(self, file_count: int) -> AsyncIterator[None]:
+        """Pause HNSW indexing while a large batch upserts, then rebuild it in one pass."""
+        if file_count <= self.settings.bulk_ingest_threshold:
+            yield
+            return
+        logger.info('🏗️ bulk_ingest indexing paused files=%s', file_count)
+        await self._set_indexing_threshold(0)
+        try:
+            yield
+        finally:
+            await self._set_indexing_threshold(self.settings.qdrant_indexing_threshold)
+            logger.info('✅ 🏗️ bulk_ingest indexing restored.')
+
+    async def _set_indexing_threshold(self, threshold: int) -> None:
+        await asyncio.to_thread(
+            self.qdrant_client.update_collection,
+            collection_name=self.settings.qdrant_collection,
+            optimizers_config=qmodels.OptimizersConfigDiff(indexing_threshold=threshold),
+        )
+
+    async def _build_ingest_plan(
         self,
         notes_dir: Path,
         manifest: Dict[str, Dict[str, Any]],
         force: bool,
-    ) -> List[Tuple[Path, str]]:
+        changed: set[str] | None = None,
+    ) -> Tuple[List[PlanEntry], List[str]]:
+        """Return files needing ingest plus manifest entries whose files are gone from ``notes_dir``."""
         logger.info('🗺️ build_ingest_plan starting...')
-        ingest_plan: List[Tuple[Path, str]] = []
+        ingest_plan: List[PlanEntry] = []
+        present_names: set[str] = set()
         for file_path in notes_dir.iterdir():
             if not file_path.is_file():
                 continue
             if file_path.suffix.lower() not in self.allowed_exts:
                 continue
-            file_hash = hash_file(file_path)
+            present_names.add(file_path.name)
+            stat_result = file_path.stat()
             existing = manifest.get(file_path.name)
+            if (
+                not force
+                and existing
+                and existing.get('mtime_ns') == stat_result.st_mtime_ns
+                and existing.get('size_bytes') == stat_result.st_size
+            ):
+                continue
+            file_hash = await asyncio.to_thread(hash_file, file_path)
             if not force and existing and existing.get('hash') == file_hash:
+                existing['mtime_ns'] = stat_result.st_mtime_ns
+                if changed is not None:
+                    changed.add(file_path.name)
                 continue
-            ingest_plan.append((file_path, file_hash))
-        logger.info('✅ 🗺️ build_ingest_plan done.')
-        return ingest_plan
+            ingest_plan.append((file_path, file_hash, stat_result))
+        deleted_names = sorted(manifest.keys() - present_names)
+        logger.info('✅ 🗺️ build_ingest_plan done deleted=%s', len(deleted_names))
+        return ingest_plan, deleted_names
 
     async def _ingest_plan(
         self,
         manifest: Dict[str, Dict[str, Any]],
-        ingest_plan: List[Tuple[Path, str]],
+        ingest_plan: List[PlanEntry],
         force: bool = False,
+        changed: set[str] | None = None,
+        deleted_names: Sequence[str] = (),
     ) -> Dict[str, int]:
         logger.info('🧾 ingest_plan starting...')
         scanned_files = len(ingest_plan)
         ingested_chunks = 0
         skipped_files = 0
-        for file_path, file_hash in ingest_plan:
-            logger.info('📄 ingest_file starting filename=%s', file_path.name)
-            document_id = self._document_id(file_path)
-            if file_path.suffix.lower() not in self.allowed_exts:
-                skipped_files += 1
-                logger.info('⚠️ ingest_file skipped filename=%s reason=extension', file_path.name)
-                continue
-            if not force:
-                existing = manifest.get(file_path.name)
-                if existing and existing.get('hash') == file_hash:
-                    logger.info('ℹ️ ingest_file skipped filename=%s reason=hash', file_path.name)
-                    continue
-            raw_text = load_document(str(file_path))
-            if not raw_text:
-                skipped_files += 1
-                logger.info('⚠️ ingest_file skipped filename=%s reason=load', file_path.name)
-                continue
-            await self._delete_existing_chunks(document_id)
-            chunk_records = chunk_text(
-                document_id=document_id,
-                filename=file_path.name,
-                raw_text=raw_text,
-                chunk_size=self.settings.chunk_size,
-                chunk_overlap=self.settings.chunk_overlap,
-                source_extension=file_path.suffix.lower(),
-                chunk_strategy=self.settings.chunk_strategy,
-            )
-            if not chunk_records:
-                skipped_files += 1
-                logger.info('⚠️ ingest_file skipped filename=%s reason=no_chunks', file_path.name)
-                continue
-            await self._upsert_chunks(chunk_records)
+        now_iso = utc_now_iso()
+        semaphore = asyncio.Semaphore(max(self.settings.ingest_concurrency, 1))
+
+        async def _process_one(
+            plan_entry: PlanEntry,
+            document_id: str,
+            chunk_records: List[Chunk],
+        ) -> Tuple[int, int]:
+            file_path, file_hash, stat_result = plan_entry
+            async with semaphore:
+                await self._delete_existing_chunks(document_id)
+                if not chunk_records:
+                    logger.info('⚠️ ingest_file skipped filename=%s reason=no_chunks', file_path.name)
+                    return 0, 1
+                await self._upsert_chunks(chunk_records)
+            # No await between here and return, so the shared manifest needs no lock.
             update_manifest_entry(
                 manifest,
                 filename=file_path.name,
                 document_id=document_id,
                 file_hash=file_hash,
                 total_chunks=len(chunk_records),
-                size_bytes=file_path.stat().st_size,
+                size_bytes=stat_result.st_size,
+                now_iso=now_iso,
+                mtime_ns=stat_result.st_mtime_ns,
             )
-            ingested_chunks += len(chunk_records)
+            if changed is not None:
+                changed.add(file_path.name)
             logger.info('✅ 📄 ingest_file done filename=%s', file_path.name)
+            return len(chunk_records), 0
+
+        window_size = max(self.settings.ingest_window_size, 1)
+        for window_start in range(0, scanned_files, window_size):
+            pending: List[Tuple[PlanEntry, str]] = []
+            chunk_jobs: List[ChunkJob] = []
+            for plan_entry in ingest_plan[window_start:window_start + window_size]:
+                file_path, file_hash, _ = plan_entry
+                logger.info('📄 ingest_file starting filename=%s', file_path.name)
+                if file_path.suffix.lower() not in self.allowed_exts:
+                    skipped_files += 1
+                    logger.info('⚠️ ingest_file skipped filename=%s reason=extension', file_path.name)
+                    continue
+                existing = manifest.get(file_path.name)
+                if not force and existing and existing.get('hash') == file_hash:
+                    logger.info('ℹ️ ingest_file skipped filename=%s reason=hash', file_path.name)
+                    continue
+                document_id = (existing or {}).get('document_id') or self._document_id(file_path)
+                raw_text = await asyncio.to_thread(load_document, str(file_path))
+                if not raw_text:
+                    skipped_files += 1
+                    logger.info('⚠️ ingest_file skipped filename=%s reason=load', file_path.name)
+                    continue
+                pending.append((plan_entry, document_id))
+                chunk_jobs.append(
+                    (
+                        document_id,
+                        file_path.name,
+                        raw_text,
+                        self.settings.chunk_size,
+                        self.settings.chunk_overlap,
+                        file_path.suffix.lower(),
+                        self.settings.chunk_strategy,
+                    )
+                )
+            if not chunk_jobs:
+                continue
+            chunk_batches = await asyncio.to_thread(chunk_text_batch, chunk_jobs)
+            del chunk_jobs
+            results = await asyncio.gather(
+                *(
+                    _process_one(plan_entry, document_id, chunk_records)
+                    for (plan_entry, document_id), chunk_records in zip(pending, chunk_batches)
+                ),
+                return_exceptions=True,
+            )
+            for ((file_path, _, _), _), result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    skipped_files += 1
+                    logger.error('💥 ingest_file failed filename=%s exc=%s', file_path.name, result)
+                    continue
+                file_chunks, file_skipped = result
+                ingested_chunks += file_chunks
+                skipped_files += file_skipped
+        if deleted_names:
+            await self._prune_deleted(manifest, deleted_names, changed)
         summary = {
             'scanned_files': scanned_files,
             'ingested_chunks': ingested_chunks,
@@ -180,25 +397,120 @@ class RagPipeline:
 
     async def generate_answer(self, query: str, mode: str = 'answer', filters: Dict[str, Any] | None = None) -> Dict[str, Any]:
         logger.info('💡 generate_answer starting...')
-        rewritten_query = await self.rewrite_query(query)
-        if not rewritten_query:
+        normalized_query = normalize_text(query or '')
+        if not normalized_query:
             logger.info('⚠️ generate_answer short_circuit empty query')
             return self._empty_answer('Query is empty. Please provide a question.', mode)
-        retrieved_chunks = await self._retrieve_chunks(rewritten_query, filters)
-        if not retrieved_chunks:
-            return self._empty_answer('No relevant context found. Try refreshing documents.', mode)
-        compressed_chunks = await self._compress_chunks(rewritten_query, retrieved_chunks)
-        if not compressed_chunks:
-            return self._empty_answer('Context limit reached without usable chunks.', mode)
-        answer_payload = await self._answer_from_context(
-            rewritten_query,
-            query,
-            mode,
-            compressed_chunks,
-        )
+        writes: List[CacheEntry] = []
+        try:
+            answer_payload, rewritten_query, context_chunks = await self._resolve_context(
+                normalized_query,
+                mode,
+                filters,
+                writes,
+            )
+            if answer_payload is None:
+                answer_payload = await self._answer_from_context(
+                    rewritten_query,
+                    query,
+                    mode,
+                    context_chunks,
+                    writes=writes,
+                )
+        finally:
+            await self.cache.flush_writes(writes)
         logger.info('✅ 💡 generate_answer done.')
         return answer_payload
 
+    async def stream_answer(
+        self,
+        query: str,
+        mode: str = 'answer',
+        filters: Dict[str, Any] | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield NDJSON-ready ``token`` events as the model generates, then one ``metadata`` event."""
+        logger.info('🌊 stream_answer starting...')
+        normalized_query = normalize_text(query or '')
+        if not normalized_query:
+            logger.info('⚠️ stream_answer short_circuit empty query')
+            payload = self._empty_answer('Query is empty. Please provide a question.', mode)
+            yield {'event': 'token', 'data': payload['answer']}
+            yield {'event': 'metadata', 'data': payload['metadata']}
+            return
+        writes: List[CacheEntry] = []
+        try:
+            payload, rewritten_query, context_chunks = await self._resolve_context(
+                normalized_query,
+                mode,
+                filters,
+                writes,
+            )
+            streamed = False
+            if payload is None:
+                prompt_inputs, sources, quotes = self._build_answer_prompt(query, mode, context_chunks)
+                if prompt_inputs is None:
+                    payload = self._empty_answer('Context chunk text unavailable.', mode)
+                else:
+                    parts: List[str] = []
+                    async for message_chunk in self._answer_chain.astream(prompt_inputs):
+                        token = message_chunk.content
+                        if token:
+                            parts.append(token)
+                            yield {'event': 'token', 'data': token}
+                    streamed = True
+                    payload = self._answer_payload(''.join(parts), sources, quotes, mode, len(context_chunks))
+                    # Only reached once the stream completes, so a client disconnect never caches a partial answer.
+                    writes.append(self.cache.answer_entry(rewritten_query, mode, payload))
+            if not streamed:
+                yield {'event': 'token', 'data': payload['answer']}
+            yield {'event': 'metadata', 'data': payload['metadata']}
+        finally:
+            await self.cache.flush_writes(writes)
+        logger.info('✅ 🌊 stream_answer done.')
+
+    async def _resolve_context(
+        self,
+        normalized_query: str,
+        mode: str,
+        filters: Dict[str, Any] | None,
+        writes: List[CacheEntry],
+    ) -> Tuple[Dict[str, Any] | None, str, List[Dict[str, Any]]]:
+        """Run rewrite/retrieve/compress, returning a finished payload instead when one applies."""
+        prefetched = await self.cache.prefetch(normalized_query, self.settings.rag_top_k, mode)
+        embed_task: asyncio.Task[List[float]] | None = None
+        if not prefetched['answer'] and (filters or not prefetched['retrieval']):
+            embed_task = asyncio.create_task(self._embed_query(normalized_query))
+        try:
+            rewritten_query = await self._rewrite_query(normalized_query, prefetched=prefetched, writes=writes)
+            if rewritten_query == normalized_query:
+                cached_answer = prefetched['answer']
+            else:
+                prefetched = None
+                if embed_task is not None:
+                    embed_task.cancel()
+                    embed_task = None
+                cached_answer = await self.cache.get_answer(rewritten_query, mode)
+            if cached_answer:
+                logger.info('✅ 🧪 answer cache hit.')
+                return cached_answer, rewritten_query, []
+            query_vector = await embed_task if embed_task is not None else None
+            retrieved_chunks = await self._retrieve_chunks(
+                rewritten_query,
+                filters,
+                prefetched=prefetched,
+                writes=writes,
+                query_vector=query_vector,
+            )
+        finally:
+            if embed_task is not None and not embed_task.done():
+                embed_task.cancel()
+        if not retrieved_chunks:
+            return self._empty_answer('No relevant context found. Try refreshing documents.', mode), rewritten_query, []
+        compressed_chunks = await self._compress_chunks(rewritten_query, retrieved_chunks, writes=writes)
+        if not compressed_chunks:
+            return self._empty_answer('Context limit reached without usable chunks.', mode), rewritten_query, []
+        return None, rewritten_query, compressed_chunks
+
     async def rewrite_query(self, query: str) -> str:
         normalized_query = normalize_text(query or '')
         if not normalized_query:
@@ -217,14 +529,85 @@ class RagPipeline:
             return []
         return await self._retrieve_chunks(rewritten_query, filters, top_k=top_k, use_cache=use_cache)
 
-    async def _rewrite_query(self, normalized_query: str) -> str:
+    async def embed_queries_batch(self, queries: Sequence[str]) -> List[List[float]]:
+        """Embed already-rewritten queries in as few requests as possible, reusing cached vectors."""
+        unique_queries = list(dict.fromkeys(queries))
+        vectors = {query: self._embed_cache[query] for query in unique_queries if query in self._embed_cache}
+        missing = [query for query in unique_queries if query not in vectors]
+        if missing:
+            for query, vector in zip(missing, await self._embed_parallel(missing)):
+                vectors[query] = vector
+                self._remember_embedding(query, vector)
+        return [vectors[query] for query in queries]
+
+    async def retrieve_chunks_batch(
+        self,
+        queries: Sequence[str],
+        filters: Sequence[Dict[str, Any] | None] | None = None,
+        top_k: int | None = None,
+        use_cache: bool = True,
+        concurrency: int = 8,
+    ) -> List[List[Dict[str, Any]]]:
+        """Retrieve for many queries with one MGET per cache layer, batched embeddings, and one write-back."""
+        logger.info('🔎 retrieve_chunks_batch starting count=%s', len(queries))
+        resolved_top_k = top_k or self.settings.rag_top_k
+        per_query_filters = list(filters) if filters is not None else [None] * len(queries)
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        writes: List[CacheEntry] = []
+        try:
+            normalized = [normalize_text(query or '') for query in queries]
+            active = [idx for idx, query in enumerate(normalized) if query]
+            cached_rewrites = await self.cache.get_rewrites([normalized[idx] for idx in active])
+            rewritten = [''] * len(queries)
+            for idx, cached in zip(active, cached_rewrites):
+                rewritten[idx] = await self._rewrite_query(
+                    normalized[idx],
+                    prefetched={'rewrite': cached},
+                    writes=writes,
+                )
+            cacheable = [idx for idx in active if use_cache and not per_query_filters[idx]]
+            cached_retrievals = await self.cache.get_retrievals([rewritten[idx] for idx in cacheable], resolved_top_k)
+            hits: set[int] = set()
+            for idx, cached in zip(cacheable, cached_retrievals):
+                if cached:
+                    results[idx] = cached
+                    hits.add(idx)
+            misses = [idx for idx in active if idx not in hits]
+            vectors = await self.embed_queries_batch([rewritten[idx] for idx in misses])
+            semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+            async def _search_one(idx: int, query_vector: List[float]) -> None:
+                async with semaphore:
+                    results[idx] = await self._vector_search(query_vector, per_query_filters[idx], resolved_top_k)
+
+            await asyncio.gather(*(_search_one(idx, vector) for idx, vector in zip(misses, vectors)))
+            cacheable_set = set(cacheable)
+            writes.extend(
+                self.cache.retrieval_entry(rewritten[idx], resolved_top_k, results[idx])
+                for idx in misses
+                if idx in cacheable_set
+            )
+        finally:
+            await self.cache.flush_writes(writes)
+        logger.info('✅ 🔎 retrieve_chunks_batch done cache_hits=%s', len(hits))
+        return results
+
+    async def _rewrite_query(
+        self,
+        normalized_query: str,
+        prefetched: Dict[str, Any] | None = None,
+        writes: List[CacheEntry] | None = None,
+    ) -> str:
         logger.info('✍️ rewrite_query starting...')
-        cached = await self.cache.get_rewrite(normalized_query)
+        if prefetched is not None:
+            cached = prefetched['rewrite']
+        else:
+            cached = await self.cache.get_rewrite(normalized_query)
         if cached:
             logger.info('✅ ✍️ rewrite_query done (cache hit).')
             return cached
         rewrite = normalized_query
-        await self.cache.set_rewrite(normalized_query, rewrite)
+        await self._write_cache(writes, self.cache.rewrite_entry(normalized_query, rewrite))
         logger.info('✅ ✍️ rewrite_query done.')
         return rewrite
 
@@ -234,24 +617,46 @@ class RagPipeline:
         filters: Dict[str, Any] | None,
         top_k: int | None = None,
         use_cache: bool = True,
+        prefetched: Dict[str, Any] | None = None,
+        writes: List[CacheEntry] | None = None,
+        query_vector: List[float] | None = None,
     ) -> List[Dict[str, Any]]:
         logger.info('🔎 retrieve_chunks starting...')
         resolved_top_k = top_k or self.settings.rag_top_k
         cache_allowed = use_cache and not filters
         if cache_allowed:
-            cached = await self.cache.get_retrieval(query, resolved_top_k)
+            if prefetched is not None and resolved_top_k == self.settings.rag_top_k:
+                cached = prefetched['retrieval']
+            else:
+                cached = await self.cache.get_retrieval(query, resolved_top_k)
             if cached:
                 logger.info('✅ 🔎 retrieve_chunks done (cache hit).')
                 return cached
+        if query_vector is None:
+            query_vector = await self._embed_query(query)
+        formatted = await self._vector_search(query_vector, filters, resolved_top_k)
+        if cache_allowed:
+            await self._write_cache(writes, self.cache.retrieval_entry(query, resolved_top_k, formatted))
+        logger.info('✅ 🔎 retrieve_chunks done.')
+        return formatted
+
+    async def _vector_search(
+        self,
+        query_vector: List[float],
+        filters: Dict[str, Any] | None,
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
         filter_condition = self._build_filter(filters) if filters else None
         if filters:
             logger.debug('🎚️ retrieve_chunks filters_applied=%s', filters)
+        search_params = self._search_params
 
         def _search() -> List[Any]:
-            return self.vector_store.similarity_search_with_score(
-                query,
-                k=resolved_top_k,
+            return self.vector_store.similarity_search_with_score_by_vector(
+                query_vector,
+                k=top_k,
                 filter=filter_condition,
+                search_params=search_params,
             )
 
         docs = await asyncio.to_thread(_search)
@@ -265,11 +670,30 @@ class RagPipeline:
                     'score': score,
                 }
             )
-        if cache_allowed:
-            await self.cache.set_retrieval(query, resolved_top_k, formatted)
-        logger.info('✅ 🔎 retrieve_chunks done.')
         return formatted
 
+    async def _embed_query(self, query: str) -> List[float]:
+        """Embed ``query`` once per process, evicting least recently used vectors."""
+        cached = self._embed_cache.get(query)
+        if cached is not None:
+            self._embed_cache.move_to_end(query)
+            return cached
+        vector = await self.embeddings.aembed_query(query)
+        self._remember_embedding(query, vector)
+        return vector
+
+    def _remember_embedding(self, query: str, vector: List[float]) -> None:
+        self._embed_cache[query] = vector
+        self._embed_cache.move_to_end(query)
+        if len(self._embed_cache) > self.settings.query_embed_cache_size:
+            self._embed_cache.popitem(last=False)
+
+    async def _write_cache(self, writes: List[CacheEntry] | None, entry: CacheEntry) -> None:
+        if writes is None:
+            await self.cache.flush_writes([entry])
+        else:
+            writes.append(entry)
+
     def _build_filter(self, filters: Dict[str, Any]) -> qmodels.Filter | None:
         must_conditions: List[qmodels.FieldCondition] = []
         for key, value in filters.items():
@@ -289,7 +713,12 @@ class RagPipeline:
             return None
         return qmodels.Filter(must=must_conditions)
 
-    async def _compress_chunks(self, query: str, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _compress_chunks(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        writes: List[CacheEntry] | None = None,
+    ) -> List[Dict[str, Any]]:
         logger.info('🪫 compress_chunks starting...')
         chunk_ids: List[str] = []
         for chunk in chunks:
@@ -300,7 +729,7 @@ class RagPipeline:
             logger.info('✅ 🪫 compress_chunks done (cache hit).')
             return cached
         trimmed = compress_chunks(chunks, max_tokens=self.settings.max_context_tokens)
-        await self.cache.set_compress(query, chunk_ids, trimmed)
+        await self._write_cache(writes, self.cache.compress_entry(query, chunk_ids, trimmed))
         logger.info('✅ 🪫 compress_chunks done.')
         return trimmed
 
@@ -310,94 +739,145 @@ class RagPipeline:
         original_query: str,
         mode: str,
         context_chunks: List[Dict[str, Any]],
+        writes: List[CacheEntry] | None = None,
     ) -> Dict[str, Any]:
         logger.info('🧪 answer_from_context starting...')
-        cached = await self.cache.get_answer(cache_key_query, mode)
-        if cached:
-            logger.info('✅ 🧪 answer_from_context done (cache hit).')
-            return cached
+        prompt_inputs, sources, quotes = self._build_answer_prompt(original_query, mode, context_chunks)
+        if prompt_inputs is None:
+            return self._empty_answer('Context chunk text unavailable.', mode)
+        response = await self._answer_chain.ainvoke(prompt_inputs)
+        payload = self._answer_payload(response.content, sources, quotes, mode, len(context_chunks))
+        await self._write_cache(writes, self.cache.answer_entry(cache_key_query, mode, payload))
+        logger.info('✅ 🧪 answer_from_context done.')
+        return payload
+
+    def _build_answer_prompt(
+        self,
+        original_query: str,
+        mode: str,
+        context_chunks: List[Dict[str, Any]],
+    ) -> Tuple[Dict[str, str] | None, List[Dict[str, Any]], List[str]]:
         context_lines: List[str] = []
         sources: List[Dict[str, Any]] = []
         quotes: List[str] = []
         seen_chunks: set[str] = set()
+        max_quote_chars = self.settings.max_quote_chars
         for chunk in context_chunks:
             chunk_id = chunk.get('chunk_id') or chunk.get('metadata', {}).get('chunk_id') or 'chunk'
+            if chunk_id in seen_chunks:
+                continue
+            seen_chunks.add(chunk_id)
             cleaned_content = (chunk.get('content') or '').strip()
             context_lines.append(f'[{chunk_id}] {cleaned_content}')
-            if chunk_id not in seen_chunks:
-                seen_chunks.add(chunk_id)
-                metadata = chunk.get('metadata', {})
-                sources.append(
-                    {
-                        'document_id': metadata.get('document_id'),
-                        'filename': metadata.get('filename'),
-                        'chunk_id': chunk_id,
-                        'page': metadata.get('page'),
-                    }
-                )
-                quotes.append(cleaned_content[:400])
+            metadata = chunk.get('metadata', {})
+            sources.append(
+                {
+                    'document_id': metadata.get('document_id'),
+                    'filename': metadata.get('filename'),
+                    'chunk_id': chunk_id,
+                    'page': metadata.get('page'),
+                }
+            )
+            quotes.append(cleaned_content[:max_quote_chars])
         context_text = '\n\n'.join(context_lines)
         if not context_text:
-            return self._empty_answer('Context chunk text unavailable.', mode)
+            return None, sources, quotes
         mode_hint = 'Answer succinctly with citations referencing [chunk-id].'
         if mode == 'verbatim':
             mode_hint = 'Return verbatim snippets with citations referencing [chunk-id].'
-        human_prompt = (
-            f'{mode_hint}\n'
-            f'Question: {original_query}\n'
-            f'Context:\n{context_text}\n'
-        )
-        response = await self.chat_model.ainvoke(
-            [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=human_prompt)]
-        )
-        payload = {
-            'answer': response.content,
+        prompt_inputs = {'mode_hint': mode_hint, 'question': original_query, 'context': context_text}
+        return prompt_inputs, sources, quotes
+
+    def _answer_payload(
+        self,
+        answer: str,
+        sources: List[Dict[str, Any]],
+        quotes: List[str],
+        mode: str,
+        retrieved_chunks: int,
+    ) -> Dict[str, Any]:
+        return {
+            'answer': answer,
             'sources': sources,
             'quotes': quotes,
             'metadata': {
                 'mode': mode,
                 'model': self.settings.openai_chat_model,
-                'retrieved_chunks': len(context_chunks),
+                'retrieved_chunks': retrieved_chunks,
             },
         }
-        await self.cache.set_answer(cache_key_query, mode, payload)
-        logger.info('✅ 🧪 answer_from_context done.')
-        return payload
+
+    async def _prune_deleted(
+        self,
+        manifest: Dict[str, Dict[str, Any]],
+        deleted_names: Sequence[str],
+        changed: set[str] | None,
+    ) -> None:
+        """Drop vectors and manifest entries for files removed from the notes directory."""
+        logger.info('🗑️ prune_deleted starting count=%s', len(deleted_names))
+        results = await asyncio.gather(
+            *(self._delete_existing_chunks(manifest[name]['document_id']) for name in deleted_names),
+            return_exceptions=True,
+        )
+        for name, result in zip(deleted_names, results):
+            if isinstance(result, BaseException):
+                # Keep the entry so the next refresh retries the delete.
+                logger.error('💥 prune_deleted failed filename=%s exc=%s', name, result)
+                continue
+            manifest.pop(name, None)
+            if changed is not None:
+                changed.add(name)
+        logger.info('✅ 🗑️ prune_deleted done.')
 
     async def _delete_existing_chunks(self, document_id: str) -> None:
         logger.info('🧽 delete_existing_chunks starting doc_id=%s', document_id)
-        filter_condition = qmodels.Filter(
-            must=[
-                qmodels.FieldCondition(
-                    key='document_id',
-                    match=qmodels.MatchValue(value=document_id),
-                )
-            ]
-        )
-        selector = qmodels.FilterSelector(filter=filter_condition)
         await asyncio.to_thread(
             self.qdrant_client.delete,
             collection_name=self.settings.qdrant_collection,
-            points_selector=selector,
+            points_selector=_selector_for_document(document_id),
         )
         logger.info('✅ 🧽 delete_existing_chunks done doc_id=%s', document_id)
 
-    async def _upsert_chunks(self, chunks: List[Dict[str, Any]]) -> None:
+    async def _upsert_chunks(self, chunks: List[Chunk]) -> None:
         logger.info('⬆️ upsert_chunks starting...')
-        texts = [chunk['content'] for chunk in chunks]
-        vectors = await self.embeddings.aembed_documents(texts)
-        payloads = [chunk['metadata'] | {'content': chunk['content']} for chunk in chunks]
+        order = sorted(range(len(chunks)), key=lambda idx: -len(chunks[idx].content))
+        sorted_vectors = await self._embed_parallel([chunks[idx].content for idx in order])
+        vectors: List[List[float]] = [[] for _ in chunks]
+        for position, original_idx in enumerate(order):
+            vectors[original_idx] = sorted_vectors[position]
+        payloads = [chunk.metadata | {'content': chunk.content} for chunk in chunks]
         points = [
-            qmodels.PointStruct(id=chunk['chunk_id'], vector=vectors[idx], payload=payloads[idx])
+            qmodels.PointStruct(id=chunk.chunk_id, vector=vectors[idx], payload=payloads[idx])
             for idx, chunk in enumerate(chunks)
         ]
-        await asyncio.to_thread(
-            self.qdrant_client.upsert,
-            collection_name=self.settings.qdrant_collection,
-            points=points,
+        batch_size = max(self.settings.upsert_batch_size, 1)
+
+        async def _upsert_batch(batch: List[qmodels.PointStruct]) -> None:
+            async with self._upsert_semaphore:
+                await asyncio.to_thread(
+                    self.qdrant_client.upsert,
+                    collection_name=self.settings.qdrant_collection,
+                    points=batch,
+                    wait=False,
+                )
+
+        await asyncio.gather(
+            *(_upsert_batch(points[start:start + batch_size]) for start in range(0, len(points), batch_size))
         )
         logger.info('✅ ⬆️ upsert_chunks done.')
 
+    async def _embed_parallel(self, texts: List[str]) -> List[List[float]]:
+        """Embed fixed-size sub-batches concurrently and return vectors in input order."""
+        batch_size = max(self.settings.embed_batch_size, 1)
+
+        async def _embed_batch(batch: List[str]) -> List[List[float]]:
+            async with self._embed_semaphore:
+                return await self.embeddings.aembed_documents(batch)
+
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(_embed_batch(batch) for batch in batches))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
     def _document_id(self, file_path: Path) -> str:
         return hash_text(str(file_path.resolve()).lower())
 
@@ -1,5 +1,7 @@
 """Prompt templates for RAG compression and generation."""
 
+from langchain_core.prompts import ChatPromptTemplate
+
 SYSTEM_PROMPT = """
 You are a helpful assistant that answers questions using the provided context. Cite the source identifiers.
 If the context does not contain the answer, reply with "I don't know" and encourage the user to refresh the knowledge base.
@@ -9,3 +11,17 @@ COMPRESSION_PROMPT = """
 Summarize the following chunks into structured facts and steps while preserving citated chunk ids:
 {context}
 """.strip()
+
+ANSWER_HUMAN_TEMPLATE = """
+{mode_hint}
+Question: {question}
+Context:
+{context}
+""".lstrip()
+
+ANSWER_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ('system', SYSTEM_PROMPT),
+        ('human', ANSWER_HUMAN_TEMPLATE),
+    ]
+)
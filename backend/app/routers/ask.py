@@ -1,6 +1,6 @@
-import json
 from typing import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 
@@ -12,6 +12,9 @@ from ..rag.pipeline import RagPipeline
 router = APIRouter(tags=['ask'])
 logger = get_logger(__name__)
 
+_TOKEN_EVENT_PREFIX = b'{"event":"token","data":'
+_EVENT_SUFFIX = b'}\n'
+
 
 def _to_response(payload: dict) -> AskResponse:
     sources = [AnswerSource(**source) for source in payload.get('sources', [])]
@@ -35,15 +38,13 @@ async def ask(request: AskRequest, pipeline: RagPipeline = Depends(get_rag_pipel
 @router.post('/ask_stream')
 async def ask_stream(request: AskRequest, pipeline: RagPipeline = Depends(get_rag_pipeline)) -> StreamingResponse:
     logger.info('🌊 ask_stream starting...')
-    rag_payload = await pipeline.generate_answer(request.query, request.mode, request.filters)
-    response = _to_response(rag_payload)
 
     async def streamer() -> AsyncGenerator[bytes, None]:
-        for line in filter(None, response.answer.split('\n')):
-            event = json.dumps({'event': 'message', 'data': line})
-            yield event.encode('utf-8') + b'\n'
-        meta_event = json.dumps({'event': 'metadata', 'data': response.metadata})
-        yield meta_event.encode('utf-8') + b'\n'
+        async for event in pipeline.stream_answer(request.query, request.mode, request.filters):
+            if event['event'] == 'token':
+                yield _TOKEN_EVENT_PREFIX + orjson.dumps(event['data']) + _EVENT_SUFFIX
+            else:
+                yield orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE)
 
     logger.info('✅ 🌊 ask_stream done.')
     return StreamingResponse(streamer(), media_type='application/x-ndjson')
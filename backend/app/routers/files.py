@@ -1,3 +1,4 @@
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -19,16 +20,16 @@ async def list_files(settings: Settings = Depends(get_settings)) -> FileListResp
     files: list[FileMetadata] = []
     manifest = load_manifest(notes_path) if notes_path.exists() else {}
     if notes_path.exists():
-        for file_path in sorted(notes_path.iterdir()):
-            if not file_path.is_file():
-                continue
-            entry = manifest.get(file_path.name, {})
+        with os.scandir(notes_path) as dir_entries:
+            file_entries = sorted((dir_entry for dir_entry in dir_entries if dir_entry.is_file()), key=lambda e: e.name)
+        for dir_entry in file_entries:
+            entry = manifest.get(dir_entry.name, {})
             last_ingested_at = entry.get('last_ingested_at')
             parsed_ingested = datetime.fromisoformat(last_ingested_at) if last_ingested_at else None
-            size_bytes = entry.get('size_bytes') or file_path.stat().st_size
+            size_bytes = entry.get('size_bytes') or dir_entry.stat().st_size
             files.append(
                 FileMetadata(
-                    filename=file_path.name,
+                    filename=dir_entry.name,
                     hash=entry.get('hash'),
                     size_bytes=size_bytes,
                     last_ingested_at=parsed_ingested,
@@ -1,4 +1,8 @@
-from typing import List
+import asyncio
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List
 
 from fastapi import APIRouter, Depends, UploadFile
 
@@ -12,6 +16,8 @@ from ..utils.files import allowed_extensions, resolve_notes_directory
 router = APIRouter(tags=['ingest'])
 logger = get_logger(__name__)
 
+UPLOAD_COPY_BUFFER = 1024 * 1024
+
 
 @router.post('/refresh', response_model=RefreshResponse)
 async def refresh(
@@ -39,7 +45,7 @@ async def upload(
 
     notes_path = resolve_notes_directory(settings, create_if_missing=True)
     allowed_exts = allowed_extensions(settings)
-    saved_paths: List[Path] = []
+    accepted: Dict[Path, UploadFile] = {}
     rejected_files = 0
 
     for upload_file in files:
@@ -49,15 +55,23 @@ async def upload(
             logger.info('⚠️ upload_request rejected filename=%s reason=extension', upload_file.filename)
             continue
         safe_name = Path(upload_file.filename).name
-        destination = notes_path / safe_name
-        with destination.open('wb') as dest_file:
-            while True:
-                chunk = await upload_file.read(1024 * 1024)
-                if not chunk:
-                    break
-                dest_file.write(chunk)
+        superseded = accepted.pop(notes_path / safe_name, None)
+        if superseded is not None:
+            logger.info('⚠️ upload_request superseded filename=%s', safe_name)
+            await superseded.close()
+        accepted[notes_path / safe_name] = upload_file
+
+    semaphore = asyncio.Semaphore(max(settings.upload_concurrency, 1))
+
+    async def _save_one(upload_file: UploadFile, destination: Path) -> Path:
+        async with semaphore:
+            await asyncio.to_thread(_copy_upload, upload_file, destination)
         await upload_file.close()
-        saved_paths.append(destination)
+        return destination
+
+    saved_paths: List[Path] = list(
+        await asyncio.gather(*(_save_one(upload_file, destination) for destination, upload_file in accepted.items()))
+    )
 
     if not saved_paths:
         logger.info('⚠️ upload_request no_accepted_files')
@@ -80,3 +94,15 @@ async def upload(
     )
     logger.info('✅ 📤 upload_request done.')
     return response
+
+
+def _copy_upload(upload_file: UploadFile, destination: Path) -> None:
+    upload_file.file.seek(0)
+    temp_path = destination.with_name(destination.name + '.part')
+    try:
+        with temp_path.open('wb') as dest_file:
+            shutil.copyfileobj(upload_file.file, dest_file, UPLOAD_COPY_BUFFER)
+        os.replace(temp_path, destination)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
@@ -1,61 +1,104 @@
+import asyncio
+import os
+import stat
 from pathlib import Path
+from typing import Dict, Iterator, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 from ..core.logging_config import get_logger
 from ..core.settings import Settings, get_settings
 from ..ingest.loaders import load_document
 from ..utils.files import allowed_extensions, resolve_notes_directory
+from ..utils.hashing import hash_file
 
 router = APIRouter(tags=['source'])
 logger = get_logger(__name__)
 
+SOURCE_TEXT_CHUNK_CHARS = 64 * 1024
+SOURCE_CACHE_CONTROL = 'private, max-age=60'
+# path -> (mtime_ns, size_bytes, etag)
+_ETAG_CACHE: Dict[str, Tuple[int, int, str]] = {}
+
 
 def _resolve_source_file(filename: str, settings: Settings) -> Path:
-    logger.info('🧭 resolve_source_file starting filename=%s', filename)
-    notes_path = resolve_notes_directory(settings, create_if_missing=False)
-    if not notes_path.exists():
+    logger.debug('🧭 resolve_source_file starting filename=%s', filename)
+    notes_dir = os.fspath(resolve_notes_directory(settings, create_if_missing=False))
+    if not os.path.isdir(notes_dir):
         logger.info('⚠️ resolve_source_file notes_dir_missing filename=%s', filename)
         raise HTTPException(status_code=404, detail='Notes directory is not initialized.')
-    target_path = (notes_path / filename).resolve()
-    try:
-        target_path.relative_to(notes_path)
-    except ValueError as exc:  # pragma: no cover - safety
+    target = os.path.realpath(os.path.join(notes_dir, filename))
+    # Both sides are realpaths, so a prefix test against the separator-terminated root blocks traversal.
+    if target != notes_dir and not target.startswith(notes_dir.rstrip(os.sep) + os.sep):
         logger.info('⚠️ resolve_source_file traversal_blocked filename=%s', filename)
-        raise HTTPException(status_code=400, detail='Invalid filename path.') from exc
-    if not target_path.is_file():
+        raise HTTPException(status_code=400, detail='Invalid filename path.')
+    try:
+        is_regular_file = stat.S_ISREG(os.stat(target).st_mode)
+    except OSError:
+        is_regular_file = False
+    if not is_regular_file:
         logger.info('⚠️ resolve_source_file missing_file filename=%s', filename)
         raise HTTPException(status_code=404, detail='Requested file does not exist.')
-    if target_path.suffix.lower() not in allowed_extensions(settings):
-        logger.info('⚠️ resolve_source_file disallowed_ext filename=%s', filename)
+    suffix = os.path.splitext(target)[1].lower()
+    if suffix not in allowed_extensions(settings):
+        logger.info('⚠️ resolve_source_file disallowed_ext filename=%s suffix=%s', filename, suffix)
         raise HTTPException(status_code=400, detail='File type is not supported.')
-    logger.debug(f'📄 {target_path = }')
-    logger.info('✅ 🧭 resolve_source_file done filename=%s', filename)
+    target_path = Path(target)
+    logger.debug('✅ 🧭 resolve_source_file done target_path=%s', target_path)
     return target_path
 
 
+async def _source_etag(file_path: Path) -> str:
+    stat_result = file_path.stat()
+    cache_key = str(file_path)
+    cached = _ETAG_CACHE.get(cache_key)
+    if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2]
+    etag = f'"{await asyncio.to_thread(hash_file, file_path)}"'
+    _ETAG_CACHE[cache_key] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+    return etag
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix('W/') for candidate in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
+
+
 @router.get('/source')
 async def download_source(
+    request: Request,
     filename: str = Query(..., description='Filename relative to NOTES_DIR.'),
     settings: Settings = Depends(get_settings),
-) -> FileResponse:
+) -> Response:
     logger.info('📦 source_download starting filename=%s', filename)
     file_path = _resolve_source_file(filename, settings)
+    etag = await _source_etag(file_path)
+    headers = {'ETag': etag, 'Cache-Control': SOURCE_CACHE_CONTROL}
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        logger.info('✅ 📦 source_download not_modified filename=%s', filename)
+        return Response(status_code=304, headers=headers)
     logger.info('✅ 📦 source_download done filename=%s', filename)
-    return FileResponse(path=file_path, filename=file_path.name)
+    return FileResponse(path=file_path, filename=file_path.name, headers=headers)
 
 
 @router.get('/source_text')
 async def download_source_text(
     filename: str = Query(..., description='Filename relative to NOTES_DIR.'),
     settings: Settings = Depends(get_settings),
-) -> PlainTextResponse:
+) -> StreamingResponse:
     logger.info('📝 source_text starting filename=%s', filename)
     file_path = _resolve_source_file(filename, settings)
-    extracted_text = load_document(str(file_path))
+    extracted_text = await asyncio.to_thread(load_document, str(file_path))
     if not extracted_text:
         logger.info('⚠️ source_text extraction_failed filename=%s', filename)
         raise HTTPException(status_code=400, detail='Unable to extract text from file.')
     logger.info('✅ 📝 source_text done filename=%s', filename)
-    return PlainTextResponse(content=extracted_text)
+    return StreamingResponse(_iter_text_chunks(extracted_text), media_type='text/plain')
+
+
+def _iter_text_chunks(text: str) -> Iterator[str]:
+    for start in range(0, len(text), SOURCE_TEXT_CHUNK_CHARS):
+        yield text[start:start + SOURCE_TEXT_CHUNK_CHARS]
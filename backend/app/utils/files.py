@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 from ..core.logging_config import get_logger
@@ -10,19 +11,25 @@ from ..core.settings import Settings
 logger = get_logger(__name__)
 
 
-def allowed_extensions(settings: Settings) -> set[str]:
-    logger.info('🧾 allowed_extensions starting...')
-    extensions = {ext.strip().lower() for ext in settings.allowed_exts.split(',') if ext.strip()}
-    logger.debug(f'📎 {extensions = }')
-    logger.info('✅ 🧾 allowed_extensions done.')
+def allowed_extensions(settings: Settings) -> frozenset[str]:
+    extensions = _parse_extensions(settings.allowed_exts)
+    logger.debug('📎 allowed_extensions extensions=%s', extensions)
     return extensions
 
 
 def resolve_notes_directory(settings: Settings, create_if_missing: bool = False) -> Path:
-    logger.info('📁 resolve_notes_directory starting...')
-    notes_path = Path(settings.notes_dir).resolve()
+    notes_path = _resolve_notes_path(settings.notes_dir)
     if create_if_missing:
         notes_path.mkdir(parents=True, exist_ok=True)
-    logger.debug(f'🧭 {notes_path = }')
-    logger.info('✅ 📁 resolve_notes_directory done.')
+    logger.debug('🧭 resolve_notes_directory notes_path=%s', notes_path)
     return notes_path
+
+
+@lru_cache(maxsize=8)
+def _parse_extensions(raw_extensions: str) -> frozenset[str]:
+    return frozenset(ext.strip().lower() for ext in raw_extensions.split(',') if ext.strip())
+
+
+@lru_cache(maxsize=8)
+def _resolve_notes_path(notes_dir: str) -> Path:
+    return Path(notes_dir).resolve()
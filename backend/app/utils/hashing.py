@@ -1,28 +1,34 @@
 import hashlib
 from pathlib import Path
+from typing import Any, BinaryIO
 
 from ..core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+DIGEST_SIZE = 16
+HASH_READ_SIZE = 4 * 1024 * 1024
+
+
+def _new_hasher() -> Any:
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
 
 def hash_text(value: str) -> str:
-    logger.info('🔐 hash_text starting...')
-    hasher = hashlib.blake2b(digest_size=16)
-    hasher.update(value.encode('utf-8'))
-    digest = hasher.hexdigest()
-    logger.debug('📄 hash_text digest=%s', digest)
-    logger.info('✅ 🔐 hash_text done.')
-    return digest
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=DIGEST_SIZE).hexdigest()
 
 
 def hash_file(path: Path) -> str:
-    logger.info('🗃️ hash_file starting...')
-    hasher = hashlib.blake2b(digest_size=16)
     with path.open('rb') as file_handle:
-        for chunk in iter(lambda: file_handle.read(8192), b''):
-            hasher.update(chunk)
-    digest = hasher.hexdigest()
+        digest = _hash_stream(file_handle).hexdigest()
     logger.debug('🧾 hash_file digest=%s path=%s', digest, path)
-    logger.info('✅ 🗃️ hash_file done.')
     return digest
+
+
+def _hash_stream(file_handle: BinaryIO) -> Any:
+    if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+        return hashlib.file_digest(file_handle, _new_hasher)
+    hasher = _new_hasher()
+    for chunk in iter(lambda: file_handle.read(HASH_READ_SIZE), b''):
+        hasher.update(chunk)
+    return hasher
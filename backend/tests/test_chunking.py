@@ -0,0 +1,30 @@
+from concurrent.futures.process import BrokenProcessPool
+
+from app.ingest import chunking
+
+
+class _BrokenPool:
+    def __init__(self) -> None:
+        self.shut_down = False
+
+    def map(self, *args, **kwargs):
+        raise BrokenProcessPool('worker died')
+
+    def shutdown(self, wait=True, cancel_futures=False) -> None:
+        self.shut_down = True
+
+
+def test_chunk_text_batch_recovers_from_broken_pool(monkeypatch):
+    broken = _BrokenPool()
+    monkeypatch.setattr(chunking, '_POOL', broken)
+    monkeypatch.setattr(chunking, 'INLINE_MAX_CHARS', 0)
+    jobs = [
+        (f'doc-{idx}', f'note-{idx}.txt', 'alpha beta gamma. ' * 20, 100, 10, '.txt', 'recursive')
+        for idx in range(2)
+    ]
+
+    results = chunking.chunk_text_batch(jobs)
+
+    assert [chunks[0].metadata['document_id'] for chunks in results] == ['doc-0', 'doc-1']
+    assert broken.shut_down
+    assert chunking._POOL is None
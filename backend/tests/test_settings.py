@@ -0,0 +1,11 @@
+from app.core.settings import Settings
+
+
+def test_settings_ignore_unknown_dotenv_keys(tmp_path):
+    env_file = tmp_path / '.env'
+    env_file.write_text('TOP_K=10\nOCR_ENABLED=1\nTESSERACT_CMD=/usr/bin/tesseract\nCHUNK_SIZE=512\n')
+
+    settings = Settings(_env_file=env_file)
+
+    assert settings.chunk_size == 512
+    assert not hasattr(settings, 'top_k')
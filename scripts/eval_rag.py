@@ -5,10 +5,12 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
+import orjson
 from redis.asyncio import Redis
 
 from backend.app.core.settings import Settings
@@ -16,21 +18,22 @@ from backend.app.rag import RagCache, RagPipeline
 
 
 def _load_cases(path: Path) -> List[Dict[str, Any]]:
-    payload = json.loads(path.read_text(encoding='utf-8'))
+    payload = orjson.loads(path.read_bytes())
     if not isinstance(payload, list):
         raise ValueError('Evaluation data must be a JSON list.')
+    for case in payload:
+        case['_expected'] = _expected_set(case.get('expected_sources', []))
     return payload
 
 
-def _expected_set(values: List[str]) -> set[str]:
-    return {value.strip().lower() for value in values if value}
+def _expected_set(values: List[str]) -> frozenset[str]:
+    return frozenset(value.strip().lower() for value in values if value)
 
 
 def _score_case(
     retrieved: List[Dict[str, Any]],
-    expected_sources: List[str],
+    expected: frozenset[str],
 ) -> Tuple[int | None, str | None]:
-    expected = _expected_set(expected_sources)
     for idx, chunk in enumerate(retrieved, start=1):
         filename = (chunk.get('metadata') or {}).get('filename', '')
         if filename and filename.lower() in expected:
@@ -43,35 +46,34 @@ async def _evaluate(
     cases: List[Dict[str, Any]],
     top_k: int | None,
     use_cache: bool,
+    concurrency: int = 8,
 ) -> Dict[str, Any]:
     total = len(cases)
-    hits = 0
-    reciprocal_sum = 0.0
+    retrieved_per_case = await pipeline.retrieve_chunks_batch(
+        [case.get('query', '') for case in cases],
+        [case.get('filters') for case in cases],
+        top_k=top_k,
+        use_cache=use_cache,
+        concurrency=concurrency,
+    )
+    ranks = np.zeros(total, dtype=np.float64)
     rows: List[Dict[str, Any]] = []
-    for case in cases:
-        query = case.get('query', '')
-        expected_sources = case.get('expected_sources', [])
-        filters = case.get('filters')
-        retrieved = await pipeline.retrieve_chunks(
-            query,
-            filters=filters,
-            top_k=top_k,
-            use_cache=use_cache,
-        )
-        rank, matched = _score_case(retrieved, expected_sources)
-        hit = 1 if rank else 0
-        hits += hit
-        reciprocal_sum += 1 / rank if rank else 0.0
+    for idx, (case, retrieved) in enumerate(zip(cases, retrieved_per_case)):
+        rank, matched = _score_case(retrieved, case['_expected'])
+        if rank:
+            ranks[idx] = rank
         rows.append(
             {
-                'query': query,
-                'hit': bool(hit),
+                'query': case.get('query', ''),
+                'hit': bool(rank),
                 'rank': rank,
                 'matched_source': matched,
             }
         )
-    recall_at_k = hits / total if total else 0.0
-    mrr = reciprocal_sum / total if total else 0.0
+    hit_mask = ranks > 0
+    reciprocal_ranks = np.divide(1.0, ranks, out=np.zeros_like(ranks), where=hit_mask)
+    recall_at_k = float(hit_mask.mean()) if total else 0.0
+    mrr = float(reciprocal_ranks.mean()) if total else 0.0
     return {
         'total': total,
         'recall_at_k': recall_at_k,
@@ -85,21 +87,28 @@ async def _run() -> int:
     parser.add_argument('--data', required=True, help='Path to JSON eval set.')
     parser.add_argument('--k', type=int, default=None, help='Override top-k for retrieval.')
     parser.add_argument('--no-cache', action='store_true', help='Bypass retrieval cache.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Cases to retrieve in parallel.')
     args = parser.parse_args()
 
     data_path = Path(args.data)
     cases = _load_cases(data_path)
 
     settings = Settings()
-    redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
+    redis_client = Redis.from_url(settings.redis_url, decode_responses=False)
     cache = RagCache(redis_client, settings)
     pipeline = RagPipeline(settings, cache)
     try:
-        results = await _evaluate(pipeline, cases, args.k, use_cache=not args.no_cache)
+        results = await _evaluate(
+            pipeline,
+            cases,
+            args.k,
+            use_cache=not args.no_cache,
+            concurrency=args.concurrency,
+        )
     finally:
         await redis_client.close()
 
-    print(json.dumps(results, indent=2))
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     return 0
 
 